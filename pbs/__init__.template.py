@@ -1,8 +1,8 @@
 """A package for submitting and managing PBS jobs"""
-from job import *
-from jobdb import *
-from misc import *
-from templates import *
+from .job import *
+from .jobdb import *
+from .misc import *
+from .templates import *
 __version__ = "VERSION_ID (git sha COMMIT_ID)"
 __all__ = dir()
 
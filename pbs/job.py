@@ -3,18 +3,110 @@
 # import subprocess
 import re
 import os
-import sys
-import StringIO
+import atexit
+import copy
+import threading
+import importlib
 
 ### Local ###
-import jobdb
-import misc
+from . import jobdb
+from . import misc
+
+### Compiled patterns used by Job.read() ###
+# '#PBS -X value' directives, the 'cd $PBS_O_WORKDIR' line and '#auto=' lines,
+# matched in a single scan of the script
+_RE_HEADER = re.compile(r"^[^\S\n]*#PBS[^\S\n]+-(?P<opt>\w)[^\S\n]*(?P<value>.*)"
+                        r"|(?P<cd>cd[^\S\n]+\$PBS_O_WORKDIR)(?:[^\S\n][^\n]*)?\n"
+                        r"|auto=[^\S\n]*(?P<auto>.*)", re.M)
+_RE_AUTO_FALSE = re.compile(r"[fF](alse)*|0")
+_RE_AUTO_TRUE = re.compile(r"[tT](rue)*|1")
+
+# Bit flags recording which required arguments Job.read() has found
+_REQ_NAME = 1
+_REQ_WALLTIME = 2
+_REQ_NODES = 4
+_REQ_PPN = 8
+_REQ_QUEUE = 16
+_REQ_CD = 32
+_REQ_COMMAND = 64
+_REQ_ALL = 127
+
+# (description, flag) of each required argument, in the order they are reported
+# in PBSReadError
+_REQUIRED = [("name", _REQ_NAME),
+             ("walltime", _REQ_WALLTIME),
+             ("nodes", _REQ_NODES),
+             ("ppn", _REQ_PPN),
+             ("queue", _REQ_QUEUE),
+             ("cd $PBS_O_WORKDIR", _REQ_CD),
+             ("command", _REQ_COMMAND)]
+
+# PBS directive letter -> (Job attribute set from its argument, required flag or 0)
+# (-l is handled separately because it carries several resources)
+_DIRECTIVE_ATTRS = {"N": ("name", _REQ_NAME),
+                    "A": ("account", 0),
+                    "a": ("exetime", 0),
+                    "q": ("queue", _REQ_QUEUE),
+                    "M": ("email", 0),
+                    "m": ("message", 0),
+                    "p": ("priority", 0)}
+
+# Open JobDB connections used by Job.submit(), kept per thread because a sqlite3
+# connection may only be used by the thread that opened it.
+# _DB_POOL.dbs is a dict keyed by (dbpath, configpath)
+_DB_POOL = threading.local()
+
+def _get_db(dbpath=None, configpath=None):
+    """ Return an open JobDB for 'dbpath' and 'configpath', opening it on first use
+
+        The JobDB belongs to the calling thread and stays open until that thread calls
+        close_dbs(). The main thread's JobDBs are also closed when the interpreter exits;
+        those of other threads are otherwise only closed when garbage collected.
+    """
+    if not hasattr(_DB_POOL, "dbs"):
+        _DB_POOL.dbs = dict()
+    key = (dbpath, configpath)
+    if key not in _DB_POOL.dbs:
+        _DB_POOL.dbs[key] = jobdb.JobDB(dbpath=dbpath, configpath=configpath)
+    return _DB_POOL.dbs[key]
+
+@atexit.register
+def close_dbs():
+    """ Close the JobDB connections kept open by Job.submit() in the calling thread
+
+        Called automatically for the main thread when the interpreter exits.
+    """
+    dbs = getattr(_DB_POOL, "dbs", dict())
+    for db in dbs.values():    #pylint: disable=invalid-name
+        db.close()
+    dbs.clear()
+
+# misc.seconds(walltime) for each walltime string seen by _walltime_seconds()
+_WALLTIME_SECONDS = dict()
+
+def _walltime_seconds(walltime):
+    """ Return misc.seconds(walltime), remembering the result for each walltime """
+    if walltime not in _WALLTIME_SECONDS:
+        _WALLTIME_SECONDS[walltime] = misc.seconds(walltime)
+    return _WALLTIME_SECONDS[walltime]
+
+class PBSReadError(misc.PBSError):
+    """ Raised by Job.read() if a submit script can not be read """
+    def __init__(self, msg, missing=None):
+        if missing is None:
+            missing = []
+        self.missing = missing
+        super(PBSReadError, self).__init__(None, msg)
+
+    def __str__(self):
+        return self.msg
 
 class Job(object):  #pylint: disable=too-many-instance-attributes
     """A qsub Job object.
 
     Initialize either with all the parameters, or with 'qsubstr' a PBS submit script as a string.
-    If 'qsubstr' is given, all other arguments are ignored and set using Job.read().
+    If 'qsubstr' is given, all other arguments except 'software' are ignored and set using
+    Job.read().
 
 
     Contains variables (with example values):
@@ -42,15 +134,14 @@ class Job(object):  #pylint: disable=too-many-instance-attributes
 
     """
 
+    __slots__ = ("name", "account", "nodes", "ppn", "walltime", "pmem", "qos", "queue",
+                 "exetime", "message", "email", "priority", "command", "auto", "software",
+                 "jobID")
 
     def __init__(self, name="STDIN", account=None, nodes=None, ppn=None, walltime=None, #pylint: disable=too-many-arguments, too-many-locals
                  pmem=None, qos=None, queue=None, exetime=None, message="a", email=None,
                  priority="0", command=None, auto=False, substr=None, software=None):
 
-        if substr != None:
-            self.read(substr)
-            return
-
         # Determines the software and loads the appropriate package
         if software is None:
             software = misc.getsoftware()
@@ -58,11 +149,16 @@ class Job(object):  #pylint: disable=too-many-instance-attributes
 
         global misc_pbs
         if self.software.strip() == "torque":
-		misc_pbs = __import__("pbs.misc_torque", globals(), locals(), [], -1).misc_torque
-	elif self.software.strip() == "slurm":
-		misc_pbs = __import__("pbs.misc_slurm", globals(), locals(), [], -1).misc_slurm
-	else:
-		misc_pbs = __import__("pbs.misc_torque", globals(), locals(), [], -1).misc_torque
+            misc_pbs = importlib.import_module("pbs.misc_torque")
+        elif self.software.strip() == "slurm":
+            misc_pbs = importlib.import_module("pbs.misc_slurm")
+        else:
+            misc_pbs = importlib.import_module("pbs.misc_torque")
+
+        if substr is not None:
+            self.read(substr)
+            self.jobID = None   #pylint: disable=invalid-name
+            return
 
         # Declares a name for the job. The name specified may be up to and including
         # 15 characters in length. It must consist of printable, non white space characters
@@ -74,10 +170,10 @@ class Job(object):  #pylint: disable=too-many-instance-attributes
         self.account = account
 
         # number of nodes to request
-        self.nodes = int(nodes)
+        self.nodes = nodes if nodes is None or isinstance(nodes, int) else int(nodes)
 
         # number of processors per node to request
-        self.ppn = int(ppn)
+        self.ppn = ppn if ppn is None or isinstance(ppn, int) else int(ppn)
 
         # string walltime for job (HH:MM:SS)
         self.walltime = walltime
@@ -85,7 +181,8 @@ class Job(object):  #pylint: disable=too-many-instance-attributes
         # string memory requested (1000mb)
         self.pmem = pmem
 
-        # qos string
+        # qos string, independent of 'queue'
+        # "#PBS -l qos=" (or "#SBATCH --qos=") is only written if this is not None
         self.qos = qos
 
         # queue string
@@ -135,6 +232,25 @@ class Job(object):  #pylint: disable=too-many-instance-attributes
 
     #
 
+    def clone(self, **kwargs):
+        """Return a copy of this Job, with any attributes given in 'kwargs' replaced
+
+           For example, to create a Job with the same settings but a different command:
+               j2 = j.clone(name="run2", command="./run 2")
+
+           The copy has not been submitted, so its jobID is None.
+        """
+        new = copy.copy(self)
+        new.jobID = None    #pylint: disable=invalid-name
+        for attr, value in kwargs.items():
+            # normalize as in __init__
+            if attr in ("nodes", "ppn"):
+                value = value if value is None or isinstance(value, int) else int(value)
+            elif attr == "auto":
+                value = bool(value)
+            setattr(new, attr, value)
+        return new
+
     def sub_string(self):   #pylint: disable=too-many-branches
         """ Write Job as a string suitable for self.software """
         if self.software.lower() == "slurm":
@@ -143,62 +259,61 @@ class Job(object):  #pylint: disable=too-many-instance-attributes
             ###    exetime
             ###    priority
             ###    auto
-            jobstr = "#!/bin/sh\n"
-            jobstr += "#SBATCH -J {0}\n".format(self.name)
+            lines = ["#!/bin/sh"]
+            lines.append("#SBATCH -J {0}".format(self.name))
             if self.account is not None:
-                jobstr += "#SBATCH -A {0}\n".format(self.account)
-            jobstr += "#SBATCH -t {0}\n".format(self.walltime)
-            jobstr += "#SBATCH -n {0}\n".format(self.nodes*self.ppn)
+                lines.append("#SBATCH -A {0}".format(self.account))
+            lines.append("#SBATCH -t {0}".format(self.walltime))
+            lines.append("#SBATCH -n {0}".format(self.nodes*self.ppn))
             if self.pmem is not None:
-                jobstr += "#SBATCH --mem-per-cpu={0}\n".format(self.pmem)
+                lines.append("#SBATCH --mem-per-cpu={0}".format(self.pmem))
             if self.qos is not None:
-                jobstr += "#SBATCH --qos={0}\n".format(self.qos)
-            if self.email != None and self.message != None:
-                jobstr += "#SBATCH --mail-user={0}\n".format(self.email)
+                lines.append("#SBATCH --qos={0}".format(self.qos))
+            if self.email is not None and self.message is not None:
+                lines.append("#SBATCH --mail-user={0}".format(self.email))
                 if 'b' in self.message:
-                    jobstr += "#SBATCH --mail-type=BEGIN\n"
+                    lines.append("#SBATCH --mail-type=BEGIN")
                 if 'e' in self.message:
-                    jobstr += "#SBATCH --mail-type=END\n"
+                    lines.append("#SBATCH --mail-type=END")
                 if 'a' in self.message:
-                    jobstr += "#SBATCH --mail-type=FAIL\n"
+                    lines.append("#SBATCH --mail-type=FAIL")
             # SLURM does assignment to no. of nodes automatically
-            # jobstr += "#SBATCH -N {0}\n".format(self.nodes)
+            # lines.append("#SBATCH -N {0}".format(self.nodes))
             if self.queue is not None:
-                jobstr += "#SBATCH -p {0}\n".format(self.queue)
-            jobstr += "{0}\n".format(self.command)
+                lines.append("#SBATCH -p {0}".format(self.queue))
+            lines.append("{0}".format(self.command))
 
-            return jobstr
+            return "\n".join(lines) + "\n"
 
         else:
             ###Write this Job as a string suitable for torque###
 
-            jobstr = "#!/bin/sh\n"
-            jobstr += "#PBS -S /bin/sh\n"
-            jobstr += "#PBS -N {0}\n".format(self.name)
+            lines = ["#!/bin/sh", "#PBS -S /bin/sh"]
+            lines.append("#PBS -N {0}".format(self.name))
             if self.exetime is not None:
-                jobstr += "#PBS -a {0}\n".format(self.exetime)
+                lines.append("#PBS -a {0}".format(self.exetime))
             if self.account is not None:
-                jobstr += "#PBS -A {0}\n".format(self.account)
-            jobstr += "#PBS -l walltime={0}\n".format(self.walltime)
-            jobstr += "#PBS -l nodes={0}:ppn={1}\n".format(self.nodes, self.ppn)
+                lines.append("#PBS -A {0}".format(self.account))
+            lines.append("#PBS -l walltime={0}".format(self.walltime))
+            lines.append("#PBS -l nodes={0}:ppn={1}".format(self.nodes, self.ppn))
             if self.pmem is not None:
-                jobstr += "#PBS -l pmem={0}\n".format(self.pmem)
+                lines.append("#PBS -l pmem={0}".format(self.pmem))
             if self.qos is not None:
-                jobstr += "#PBS -l qos={0}\n".format(self.qos)
+                lines.append("#PBS -l qos={0}".format(self.qos))
             if self.queue is not None:
-                jobstr += "#PBS -q {0}\n".format(self.queue)
-            if self.email != None and self.message != None:
-                jobstr += "#PBS -M {0}\n".format(self.email)
-                jobstr += "#PBS -m {0}\n".format(self.message)
-            jobstr += "#PBS -V\n"
-            jobstr += "#PBS -p {0}\n\n".format(self.priority)
-            jobstr += "#auto={0}\n\n".format(self.auto)
-            jobstr += "echo \"I ran on:\"\n"
-            jobstr += "cat $PBS_NODEFILE\n\n"
-            jobstr += "cd $PBS_O_WORKDIR\n"
-            jobstr += "{0}\n".format(self.command)
+                lines.append("#PBS -q {0}".format(self.queue))
+            if self.email is not None and self.message is not None:
+                lines.append("#PBS -M {0}".format(self.email))
+                lines.append("#PBS -m {0}".format(self.message))
+            lines.append("#PBS -V")
+            lines.append("#PBS -p {0}\n".format(self.priority))
+            lines.append("#auto={0}\n".format(self.auto))
+            lines.append("echo \"I ran on:\"")
+            lines.append("cat $PBS_NODEFILE\n")
+            lines.append("cd $PBS_O_WORKDIR")
+            lines.append("{0}".format(self.command))
 
-            return jobstr
+            return "\n".join(lines) + "\n"
 
 
 
@@ -212,29 +327,74 @@ class Job(object):  #pylint: disable=too-many-instance-attributes
         with open(filename, "w") as myfile:
             myfile.write(self.sub_string())
 
-    def submit(self, add=True, dbpath=None, configpath=None):
+    def submit(self, add=True, dbpath=None, configpath=None, db=None):  #pylint: disable=invalid-name
         """Submit this Job using qsub
 
            add: Should this job be added to the JobDB database?
            dbpath: Specify a non-default JobDB database
+           db: An open JobDB to add this job to. If given, dbpath and configpath are
+               ignored.
+
+           Unless 'db' is given, the JobDB connection is kept open and reused by later
+           submissions to the same database from the same thread, until
+           pbs.close_dbs() is called or the interpreter exits.
 
            Raises PBSError if error submitting the job.
 
         """
+        qsubstr = self._submit()
+
+        if add:
+            if db is None:
+                db = _get_db(dbpath, configpath)    #pylint: disable=invalid-name
+            db.add(self._job_status(qsubstr))
+
+    def _submit(self):
+        """ Submit this Job using qsub, set self.jobID, and return the submitted script """
+        qsubstr = self.sub_string()
         try:
-            self.jobID = misc_pbs.submit(substr=self.sub_string())
+            self.jobID = misc_pbs.submit(substr=qsubstr)
         except misc.PBSError as e:  #pylint: disable=invalid-name
             raise e
+        return qsubstr
 
-        if add:
-            db = jobdb.JobDB(dbpath=dbpath, configpath=configpath) #pylint: disable=invalid-name
-            status = jobdb.job_status_dict(jobid=self.jobID, jobname=self.name,
-                                           rundir=os.getcwd(), jobstatus="?",
-                                           auto=self.auto, qsubstr=self.sub_string(),
-                                           walltime=misc.seconds(self.walltime),
-                                           nodes=self.nodes, procs=self.nodes*self.ppn)
-            db.add(status)
-            db.close()
+    @classmethod
+    def submit_many(cls, jobs, dbpath=None, configpath=None):
+        """Submit several Jobs using qsub and add them to the JobDB database
+
+           jobs: iterable of Job objects
+           dbpath: Specify a non-default JobDB database
+           configpath: Specify a non-default JobDB config file
+
+           All submitted jobs are added in a single transaction. If an error occurs,
+           the jobs submitted so far are still added. The JobDB connection is kept
+           open and reused as in Job.submit().
+
+           Raises PBSError if error submitting a job.
+
+        """
+        db = _get_db(dbpath, configpath)    #pylint: disable=invalid-name
+        status = []
+        try:
+            for job in jobs:
+                qsubstr = job._submit()    #pylint: disable=protected-access
+                status.append(job._job_status(qsubstr))  #pylint: disable=protected-access
+        except Exception:   #pylint: disable=broad-except
+            # add the jobs submitted so far, then re-raise the original error
+            try:
+                db.add_many(status)
+            except Exception:   #pylint: disable=broad-except
+                pass
+            raise
+        db.add_many(status)
+
+    def _job_status(self, qsubstr):
+        """ Return the jobdb.job_status_dict() record for this Job, submitted as 'qsubstr' """
+        return jobdb.job_status_dict(jobid=self.jobID, jobname=self.name,
+                                     rundir=os.getcwd(), jobstatus="?",
+                                     auto=self.auto, qsubstr=qsubstr,
+                                     walltime=_walltime_seconds(self.walltime),
+                                     nodes=self.nodes, procs=self.nodes*self.ppn)
 
 
     def read(self, qsubstr):    #pylint: disable=too-many-branches, too-many-statements
@@ -244,13 +404,12 @@ class Job(object):  #pylint: disable=too-many-instance-attributes
            Will ignore any arguments not included in pbs.Job()'s attributes.
            Will add default optional arguments (-A, -a, -l pmem=(.*), -l qos=(.*),
                 -M, -m, -p, "Auto:") if not found
-           Will exit() if required arguments (-N, -l walltime=(.*), -l nodes=(.*):ppn=(.*),
-                -q, cd $PBS_O_WORKDIR) not found
+           Raises PBSReadError if required arguments (-N, -l walltime=(.*),
+                -l nodes=(.*):ppn=(.*), -q, cd $PBS_O_WORKDIR) not found, with the
+                names of the missing arguments in its 'missing' attribute
            Will always include -V
 
         """
-        s = StringIO.StringIO(qsubstr)  #pylint: disable=invalid-name
-
         self.pmem = None
         self.email = None
         self.message = "a"
@@ -260,139 +419,65 @@ class Job(object):  #pylint: disable=too-many-instance-attributes
         self.exetime = None
         self.qos = None
 
-        optional = dict()
-        optional["account"] = "Default: None"
-        optional["pmem"] = "Default: None"
-        optional["email"] = "Default: None"
-        optional["message"] = "Default: a"
-        optional["priority"] = "Default: 0"
-        optional["auto"] = "Default: False"
-        optional["exetime"] = "Default: None"
-        optional["qos"] = "Default: None"
-
-        required = dict()
-        required["name"] = "Not Found"
-        required["walltime"] = "Not Found"
-        required["nodes"] = "Not Found"
-        required["ppn"] = "Not Found"
-        required["queue"] = "Not Found"
-        required["cd $PBS_O_WORKDIR"] = "Not Found"
-        required["command"] = "Not Found"
-
-        while True:
-            line = s.readline()
-            #print line,
-
-            if re.search("#PBS", line):
-
-                m = re.search(r"-N\s+(.*)\s", line) #pylint: disable=invalid-name
-                if m:
-                    self.name = m.group(1)
-                    required["name"] = self.name
-
-                m = re.search(r"-A\s+(.*)\s", line)  #pylint: disable=invalid-name
-                if m:
-                    self.account = m.group(1)
-                    optional["account"] = self.account
-
-                m = re.search(r"-a\s+(.*)\s", line)  #pylint: disable=invalid-name
-                if m:
-                    self.exetime = m.group(1)
-                    optional["exetime"] = self.exetime
-
-                m = re.search(r"\s-l\s", line)   #pylint: disable=invalid-name
-                if m:
-                    m = re.search(r"walltime=([0-9:]+)", line)   #pylint: disable=invalid-name
-                    if m:
-                        self.walltime = m.group(1)
-                        required["walltime"] = self.walltime
-
-                    m = re.search(r"nodes=([0-9]+):ppn=([0-9]+)", line)   #pylint: disable=invalid-name
-                    if m:
-                        self.nodes = int(m.group(1))
-                        self.ppn = int(m.group(2))
-                        required["nodes"] = self.nodes
-                        required["ppn"] = self.ppn
-
-                    m = re.search(r"pmem=([^,\s]+)", line)    #pylint: disable=invalid-name
-                    if m:
-                        self.pmem = m.group(1)
-                        optional["pmem"] = self.pmem
-
-                    m = re.search(r"qos=([^,\s]+)", line) #pylint: disable=invalid-name
-                    if m:
-                        self.qos = m.group(1)
-                        optional["qos"] = self.qos
-                #
-
-                m = re.search(r"-q\s+(.*)\s", line)  #pylint: disable=invalid-name
-                if m:
-                    self.queue = m.group(1)
-                    required["queue"] = self.queue
-
-                m = re.match(r"-M\s+(.*)\s", line) #pylint: disable=invalid-name
-                if m:
-                    self.email = m.group(1)
-                    optional["email"] = self.email
-
-                m = re.match(r"-m\s+(.*)\s", line) #pylint: disable=invalid-name
-                if m:
-                    self.message = m.group(1)
-                    optional["message"] = self.message
-
-                m = re.match(r"-p\s+(.*)\s", line)   #pylint: disable=invalid-name
-                if m:
-                    self.priority = m.group(1)
-                    optional["priority"] = self.priority
-            #
-
-            m = re.search(r"auto=\s*(.*)\s", line)   #pylint: disable=invalid-name
-            if m:
-                if re.match("[fF](alse)*|0", m.group(1)):
+        # bit flags of the required arguments found so far
+        found = 0
+
+        for tok in _RE_HEADER.finditer(qsubstr):
+            kind = tok.lastgroup
+
+            if kind == "cd":
+                # everything after 'cd $PBS_O_WORKDIR' is the command
+                self.command = qsubstr[tok.end():]
+                found |= _REQ_CD | _REQ_COMMAND
+                break
+
+            if kind == "auto":
+                auto = tok.group("auto")
+                if _RE_AUTO_FALSE.match(auto):
                     self.auto = False
-                    optional["auto"] = self.auto
-                elif re.match("[tT](rue)*|1", m.group(1)):
+                elif _RE_AUTO_TRUE.match(auto):
                     self.auto = True
-                    optional["auto"] = self.auto
                 else:
-                    print "Error in pbs.Job().read(). '#auto=' argument not understood:", line
-                    sys.exit()
-
-            m = re.search(r"cd\s+\$PBS_O_WORKDIR\s+", line)  #pylint: disable=invalid-name
-            if m:
-                required["cd $PBS_O_WORKDIR"] = "Found"
-                self.command = s.read()
-                required["command"] = self.command
-                break
+                    raise PBSReadError(
+                        "Error in pbs.Job.read(). '#auto=' argument not understood: "
+                        + tok.group(0))
+                continue
+
+            opt, value = tok.group("opt"), tok.group("value").strip()
+            if opt == "l":
+                # resources may be comma separated: -l walltime=1:00:00,nodes=1:ppn=16
+                for res in value.replace(",", " ").split():
+                    key, _, val = res.partition("=")
+                    if not val:
+                        continue
+                    if key == "walltime":
+                        # walltime=[[HH:]MM:]SS
+                        if not val.strip("0123456789:"):
+                            self.walltime = val
+                            found |= _REQ_WALLTIME
+                    elif key == "nodes":
+                        # nodes=N:ppn=P[:...]
+                        fields = val.split(":")
+                        ppn = [f[4:] for f in fields[1:] if f.startswith("ppn=")]
+                        if fields[0].isdigit() and ppn and ppn[0].isdigit():
+                            self.nodes = int(fields[0])
+                            self.ppn = int(ppn[0])
+                            found |= _REQ_NODES | _REQ_PPN
+                    elif key == "pmem":
+                        self.pmem = val
+                    elif key == "qos":
+                        self.qos = val
+
+            elif opt in _DIRECTIVE_ATTRS and value:
+                attr, flag = _DIRECTIVE_ATTRS[opt]
+                setattr(self, attr, value)
+                found |= flag
         # end for
 
         # check for required arguments
-        for k in required.keys():
-            if required[k] == "Not Found":
-
-                print "Error in pbs.Job.read(). Not all required arguments were found.\n"
-
-                # print what we found:
-                print "Optional arguments:"
-                for k, v in optional.iteritems():    #pylint: disable=invalid-name
-                    print k + ":", v
-                print "\nRequired arguments:"
-                for k, v in required.iteritems():    #pylint: disable=invalid-name
-                    if k == "command":
-                        print k + ":"
-                        print "--- Begin command ---"
-                        print v
-                        print "--- End command ---"
-                    else:
-                        print k + ":", v
-
-                sys.exit()
-        # end if
+        if found != _REQ_ALL:
+            missing = [k for k, flag in _REQUIRED if not found & flag]
+            raise PBSReadError(
+                "Error in pbs.Job.read(). Not all required arguments were found: "
+                + ", ".join(missing), missing)
     # end def
-
-
-
-
-
-
-
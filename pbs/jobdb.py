@@ -1,4 +1,5 @@
 """ JobDB class and associated functions and methods """
+from __future__ import print_function
 #pylint: disable=too-many-lines
 global pbs_misc
 
@@ -8,11 +9,12 @@ import sys
 import socket
 import time
 import re
+import importlib
 # import subprocess
 # import datetime
 import json
 
-import misc
+from . import misc
 
 class JobDBError(Exception):
     """ Custom error class for JobDBs"""
@@ -216,14 +218,14 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
 
         if self.config["software"] == "torque":
             # import misc_torque as misc_pbs      #pylint: disable=redefined-outer-name
-            misc_pbs = __import__("pbs.misc_torque", globals(), locals(), [], -1).misc_torque
+            misc_pbs = importlib.import_module("pbs.misc_torque")
         elif self.config["software"] == "slurm":
             # import misc_slurm as misc
             # import misc_torque as misc_pbs      #pylint: disable=redefined-outer-name
-            misc_pbs = __import__("pbs.misc_slurm", globals(), locals(), [], -1).misc_slurm
+            misc_pbs = importlib.import_module("pbs.misc_slurm")
         else:
             # import misc_torque as misc_pbs      #pylint: disable=redefined-outer-name
-            misc_pbs = __import__("pbs.misc_torque", globals(), locals(), [], -1).misc_torque
+            misc_pbs = importlib.import_module("pbs.misc_torque")
 
         # list of dict() from misc.job_status for jobs not tracked in database:
         # refreshed upon update()
@@ -252,20 +254,20 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
             if "PBS_JOB_DB" in os.environ:
                 dbpath = os.environ("PBS_JOB_DB")
                 if not os.path.isdir(dbpath):
-                    print "Error in pbs.jobdb.JobDB.connect()."
-                    print "  PBS_JOB_DB:", dbpath
-                    print "  Does not exist"
+                    print("Error in pbs.jobdb.JobDB.connect().")
+                    print("  PBS_JOB_DB:", dbpath)
+                    print("  Does not exist")
                     sys.exit()
             else:
                 dbpath = os.path.join(os.environ["HOME"], ".pbs")
                 if not os.path.isdir(dbpath):
-                    print "Creating directory:", dbpath
+                    print("Creating directory:", dbpath)
                     os.mkdir(dbpath)
             dbpath = os.path.join(dbpath, "jobs.db")
         else:
             if not os.path.isfile(dbpath):
-                print ("Error in pbs.jobdb.JobDB.connect(). argument dbpath =",
-                       dbpath, "is not a file.")
+                print("Error in pbs.jobdb.JobDB.connect(). argument dbpath =",
+                      dbpath, "is not a file.")
                 sys.exit()
 
 
@@ -273,25 +275,25 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
             if "PBS_JOB_DB" in os.environ:
                 configpath = os.environ("PBS_JOB_DB")
                 if not os.path.isdir(configpath):
-                    print "Error in pbs.jobdb.JobDB.connect()."
-                    print "  PBS_JOB_DB:", configpath
-                    print "  Does not exist"
+                    print("Error in pbs.jobdb.JobDB.connect().")
+                    print("  PBS_JOB_DB:", configpath)
+                    print("  Does not exist")
                     sys.exit()
             else:
                 configpath = os.path.join(os.environ["HOME"], ".pbs")
                 if not os.path.isdir(configpath):
-                    print "Creating directory:", configpath
+                    print("Creating directory:", configpath)
                     os.mkdir(configpath)
             configpath = os.path.join(configpath, "config.json")
         else:
             if not os.path.isfile(configpath):
-                print ("Error in pbs.jobdb.JobDB.connect(). argument configpath =",
-                       configpath, "is not a file.")
+                print("Error in pbs.jobdb.JobDB.connect(). argument configpath =",
+                      configpath, "is not a file.")
                 sys.exit()
 
 
         if not os.path.isfile(configpath):
-            print "Writing Config:", configpath
+            print("Writing Config:", configpath)
             self.config = {"software" : misc.getsoftware(), "version" : misc.getversion()}
             with open(configpath, "w") as my_json:
                 json.dump(self.config, my_json, indent=0)
@@ -300,7 +302,7 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
                 self.config = json.load(my_json)
 
         if not os.path.isfile(dbpath):
-            print "Creating Database:", dbpath
+            print("Creating Database:", dbpath)
             self.conn = sqlite3.connect(dbpath)
             self.conn.row_factory = sqlite3.Row
             self.conn.create_function("REGEXP", 2, regexp)
@@ -333,6 +335,26 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
         self.conn.commit()
 
 
+    def add_many(self, job_status_list):
+        """Add several records to the jobs database in a single transaction.
+
+           Accepts 'job_status_list', a list of dictionaries of data comprising the
+           records. Create each using pbs.jobdb.job_status_dict().
+
+        """
+        if not job_status_list:
+            return
+        (colstr, questionstr, _) = sql_insert_str(job_status_list[0])
+        keys = list(job_status_list[0].keys())
+        insertstr = "INSERT INTO jobs {0} VALUES {1}".format(colstr, questionstr)
+        vals = []
+        for job_status in job_status_list:
+            job_status["auto"] = int(bool(job_status["auto"]))
+            vals.append(tuple([job_status[k] for k in keys]))
+        self.curs.executemany(insertstr, vals)
+        self.conn.commit()
+
+
     def update(self):
         """Update records using qstat.
 
@@ -380,7 +402,7 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
                     self.untracked.append(active_status[k])
 
         # update database with latest job status
-        for key, jobstatus in newstatus.iteritems():
+        for key, jobstatus in newstatus.items():
             if jobstatus == "C":
                 self.curs.execute(
                     "UPDATE jobs SET jobstatus=?, elapsedtime=?, modifytime=? WHERE jobid=?",
@@ -411,8 +433,8 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
 
     def select_job(self, jobid):
         """Return record (sqlite3.Row object) for one job with given jobid."""
-        if not isinstance(jobid, str) and not isinstance(jobid, unicode):
-            print "Error in pbs.JobDB.select_job(). type(id):", type(jobid), "expected str."
+        if not isinstance(jobid, misc.STRING_TYPES):
+            print("Error in pbs.JobDB.select_job(). type(id):", type(jobid), "expected str.")
             sys.exit()
 
         self.curs.execute("SELECT * FROM jobs WHERE jobid=?", (jobid,))
@@ -447,8 +469,8 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
 
            The parent is the job with continuation_jobid = given jobid
         """
-        if not isinstance(jobid, str) and not isinstance(jobid, unicode):
-            print "Error in pbs.JobDB.select_parent(). type(id):", type(jobid), "expected str."
+        if not isinstance(jobid, misc.STRING_TYPES):
+            print("Error in pbs.JobDB.select_parent(). type(id):", type(jobid), "expected str.")
             sys.exit()
 
         self.curs.execute("SELECT * FROM jobs WHERE continuation_jobid=?", (jobid,))
@@ -456,10 +478,10 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
         if len(r) == 0:
             return None
         elif len(r) > 1:
-            print ("Error in pbs.JobDB.select_parent().",
-                   len(r),
-                   " records with continuation_jobid:",
-                   jobid, " found.")
+            print("Error in pbs.JobDB.select_parent().",
+                  len(r),
+                  " records with continuation_jobid:",
+                  jobid, " found.")
             sys.exit()
         return r[0]
 
@@ -477,14 +499,14 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
         self.curs.execute("SELECT * FROM jobs WHERE jobid=?", (r["continuation_jobid"],))
         r = self.curs.fetchall()    #pylint: disable=invalid-name
         if len(r) == 0:
-            print ("Error in pbs.JobDB.select_child(). jobid:",
-                   jobid, " child:", r["continuation_jobid"],
-                   "not found.")
+            print("Error in pbs.JobDB.select_child(). jobid:",
+                  jobid, " child:", r["continuation_jobid"],
+                  "not found.")
             sys.exit()
         elif len(r) > 1:
-            print ("Error in pbs.JobDB.select_child().",
-                   len(r), " records with child jobid:",
-                   r["continuation_jobid"], " found.")
+            print("Error in pbs.JobDB.select_child().",
+                  len(r), " records with child jobid:",
+                  r["continuation_jobid"], " found.")
             sys.exit()
         return r[0]
 
@@ -902,12 +924,12 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
 
     def print_header(self): #pylint: disable=no-self-use
         """Print header rows for record summary"""
-        print ("{0:<12} {1:<24} {2:^5} {3:^5} {4:>12} {5:^1} {6:>12} {7:<24} {8:^1} {9:<12}"
-               .format("JobID", "JobName", "Nodes", "Procs", "Walltime", "S", "Runtime",
-                       "Task", "A", "ContJobID"))
-        print ("{0:-^12} {1:-^24} {2:-^5} {3:-^5} {4:->12} {5:-^1} {6:->12}\
+        print("{0:<12} {1:<24} {2:^5} {3:^5} {4:>12} {5:^1} {6:>12} {7:<24} {8:^1} {9:<12}"
+              .format("JobID", "JobName", "Nodes", "Procs", "Walltime", "S", "Runtime",
+                      "Task", "A", "ContJobID"))
+        print("{0:-^12} {1:-^24} {2:-^5} {3:-^5} {4:->12} {5:-^1} {6:->12}\
                 {7:-<24} {8:-^1} {9:-^12}"
-               .format("-", "-", "-", "-", "-", "-", "-", "-", "-", "-"))
+              .format("-", "-", "-", "-", "-", "-", "-", "-", "-", "-"))
 
 
     def print_record(self, r):  #pylint: disable=invalid-name, no-self-use
@@ -926,10 +948,10 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
             elif isinstance(d[k], int):
                 d[k] = misc.strftimedelta(d[k])
 
-        print ("{0:<12} {1:<24} {2:^5} {3:^5} {4:>12} {5:^1} {6:>12} {7:<24} {8:^1} {9:<12}"
-               .format(d["jobid"], d["jobname"], d["nodes"], d["procs"], d["walltime"],
-                       d["jobstatus"], d["elapsedtime"], d["taskstatus"], d["auto"],
-                       d["continuation_jobid"]))
+        print("{0:<12} {1:<24} {2:^5} {3:^5} {4:>12} {5:^1} {6:>12} {7:<24} {8:^1} {9:<12}"
+              .format(d["jobid"], d["jobname"], d["nodes"], d["procs"], d["walltime"],
+                      d["jobstatus"], d["elapsedtime"], d["taskstatus"], d["auto"],
+                      d["continuation_jobid"]))
 
 
     def print_full_record(self, r): #pylint: disable=invalid-name, no-self-use
@@ -937,16 +959,16 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
 
             r: a dict-like object
         """
-        print "#Record:"
+        print("#Record:")
         for key in r.keys():
-            if isinstance(r[key], (str, unicode)):
+            if isinstance(r[key], misc.STRING_TYPES):
                 s = "\"" + r[key] + "\""    #pylint: disable=invalid-name
                 if re.search("\n", s):
                     s = "\"\"" + s + "\"\"" #pylint: disable=invalid-name
-                print key, "=", s
+                print(key, "=", s)
             else:
-                print key, "=", r[key]
-        print ""
+                print(key, "=", r[key])
+        print("")
 
 
     def print_job(self, jobid=None, job=None, full=False, series=False):
@@ -966,7 +988,7 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
             else:
                 for r in series:    #pylint: disable=invalid-name
                     self.print_record(r)
-            print ""
+            print("")
         else:
             if job is None:
                 job = self.select_job(jobid)
@@ -1016,7 +1038,7 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
              full: If True, print as key:val pair list, If (default) False,
                 print single row summary in 'qstat' style.
         """
-        print "\n\nUntracked:"
+        print("\n\nUntracked:")
         if not full:
             self.print_header()
         sort = sorted(self.untracked, key=lambda rec: rec["jobid"])
@@ -1040,7 +1062,7 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
              series: If True, print records as groups of auto submitting job
                 series. If (default) False, print in order found.
         """
-        print "\n\nTracked:"
+        print("\n\nTracked:")
         self.curs.execute("SELECT * FROM jobs")
         if not full:
             self.print_header()
@@ -1058,7 +1080,7 @@ class JobDB(object):    #pylint: disable=too-many-instance-attributes, too-many-
              series: If True, print records as groups of auto submitting job
                 series. If (default) False, print in order found.
         """
-        print "\n\nTracked:"
+        print("\n\nTracked:")
         self.curs.execute("SELECT * FROM jobs WHERE taskstatus!='Complete'\
                            AND taskstatus!='Aborted' AND taskstatus!='Continued'")
         if not full:
@@ -1082,14 +1104,14 @@ def complete_job(jobid=None, dbpath=None,):
 
     if db.config["software"] == "torque":
         # import misc_torque as misc_pbs      #pylint: disable=redefined-outer-name
-        misc_pbs = __import__("pbs.misc_torque", globals(), locals(), [], -1).misc_torque
+        misc_pbs = importlib.import_module("pbs.misc_torque")
     elif db.config["software"] == "slurm":
         # import misc_slurm as misc
         # import misc_torque as misc_pbs      #pylint: disable=redefined-outer-name
-        misc_pbs = __import__("pbs.misc_slurm", globals(), locals(), [], -1).misc_slurm
+        misc_pbs = importlib.import_module("pbs.misc_slurm")
     else:
         # import misc_torque as misc_pbs      #pylint: disable=redefined-outer-name
-        misc_pbs = __import__("pbs.misc_torque", globals(), locals(), [], -1).misc_torque
+        misc_pbs = importlib.import_module("pbs.misc_torque")
 
     if jobid is None:
         jobid = misc_pbs.job_id()
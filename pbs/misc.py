@@ -1,13 +1,27 @@
 """ Misc functions for interacting between the OS and the pbs module """
+from __future__ import print_function
 
 import subprocess
 import os
-import StringIO
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
 # import re
 import datetime
 # import time
 import sys
-from distutils.spawn import find_executable
+try:
+    from shutil import which as find_executable
+except ImportError:
+    # Python 2.7
+    from distutils.spawn import find_executable    #pylint: disable=import-error
+
+# types accepted as a string, such as a jobid read from the JobDB
+try:
+    STRING_TYPES = (str, unicode)  #pylint: disable=undefined-variable
+except NameError:
+    STRING_TYPES = (str,)
 
 class PBSError(Exception):
     """ A custom error class for pbs errors """
@@ -43,23 +57,23 @@ def getversion(software=None):
     """Returns the software version """
     if software is None:
         software = getsoftware()
-    if software is "torque":
+    if software == "torque":
         opt = ["qstat", "--version"]
 
         # call 'qstat' using subprocess
-        p = subprocess.Popen(opt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) #pylint: disable=invalid-name
+        p = subprocess.Popen(opt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True) #pylint: disable=invalid-name
         stdout, stderr = p.communicate()    #pylint: disable=unused-variable
-        sout = StringIO.StringIO(stdout)
+        sout = StringIO(stdout)
 
         # return the version number
         return sout.read().rstrip("\n").lower().lstrip("version: ")
-    elif software is "slurm":
+    elif software == "slurm":
         opt = ["squeue", "--version"]
 
         # call 'squeue' using subprocess
-        p = subprocess.Popen(opt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) #pylint: disable=invalid-name
+        p = subprocess.Popen(opt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True) #pylint: disable=invalid-name
         stdout, stderr = p.communicate()    #pylint: disable=unused-variable
-        sout = StringIO.StringIO(stdout)
+        sout = StringIO(stdout)
 
         # return the version number
         return sout.read().rstrip("\n").lstrip("slurm ")
@@ -82,7 +96,7 @@ def seconds(walltime):
                 + float(wtime[1])*60.0
                 + float(wtime[2]))
     else:
-        print "Error in walltime format:", walltime
+        print("Error in walltime format:", walltime)
         sys.exit()
 
 def hours(walltime):
@@ -100,7 +114,7 @@ def hours(walltime):
                 + float(wtime[1])/60.0
                 + float(wtime[2])/3600.0)
     else:
-        print "Error in walltime format:", walltime
+        print("Error in walltime format:", walltime)
         sys.exit()
 
 def strftimedelta(seconds):     #pylint: disable=redefined-outer-name
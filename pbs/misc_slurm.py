@@ -1,11 +1,15 @@
 """ Misc functions for interfacing between torque and the pbs module """
+from __future__ import print_function
 
 #pylint: disable=line-too-long, too-many-locals, too-many-branches
 
 ### External ###
 import subprocess
 import os
-import StringIO
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
 import re
 import datetime
 import time
@@ -35,10 +39,10 @@ def _squeue(jobid=None, username=getlogin(), full=False, version=getversion(), s
                 sopt = ["scontrol", "show", "job"]
 
                 # Submit the command
-                p = subprocess.Popen(sopt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)     #pylint: disable=invalid-name
+                p = subprocess.Popen(sopt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)     #pylint: disable=invalid-name
                 stdout, stderr = p.communicate()        #pylint: disable=unused-variable
 
-                sout = StringIO.StringIO(stdout)
+                sout = StringIO(stdout)
 
                 # Nothing to strip, as scontrol provides no headers
                 return sout.read()
@@ -48,10 +52,10 @@ def _squeue(jobid=None, username=getlogin(), full=False, version=getversion(), s
                 # squeue (-h strips the header)
                 sopt = ["squeue", "-h", "-u", username]
 
-                q = subprocess.Popen(sopt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)     #pylint: disable=invalid-name
+                q = subprocess.Popen(sopt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)     #pylint: disable=invalid-name
                 stdout, stderr = q.communicate()    #pylint: disable=unused-variable
 
-                qsout = StringIO.StringIO(stdout)
+                qsout = StringIO(stdout)
 
                 # Get the jobids
                 jobid = []
@@ -68,7 +72,7 @@ def _squeue(jobid=None, username=getlogin(), full=False, version=getversion(), s
             for my_id in jobid:
                 sopt = opt + [str(my_id)]
 
-                q = subprocess.Popen(sopt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)     #pylint: disable=invalid-name
+                q = subprocess.Popen(sopt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)     #pylint: disable=invalid-name
                 stdout, stderr = q.communicate()    #pylint: disable=unused-variable
 
                 sreturn = sreturn + stdout + "\n"
@@ -93,10 +97,10 @@ def _squeue(jobid=None, username=getlogin(), full=False, version=getversion(), s
             else:
                 sopt += ["-o", "'%i %j %u %M %t %P'"]
 
-        q = subprocess.Popen(sopt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)     #pylint: disable=invalid-name
+        q = subprocess.Popen(sopt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)     #pylint: disable=invalid-name
         stdout, stderr = q.communicate()    #pylint: disable=unused-variable
 
-        sout = StringIO.StringIO(stdout)
+        sout = StringIO(stdout)
 
         # return the remaining text
         return sout.read()
@@ -112,7 +116,7 @@ def job_id(all=False, name=None):       #pylint: disable=redefined-builtin
     if all or name is not None:
         jobid = []
         stdout = _squeue()
-        sout = StringIO.StringIO(stdout)
+        sout = StringIO(stdout)
         for line in sout:
             if name is not None:
                 if line.split()[3] == name:
@@ -165,7 +169,7 @@ def job_status(jobid=None):
     status = dict()
 
     stdout = _squeue(jobid=jobid, full=True)
-    sout = StringIO.StringIO(stdout)
+    sout = StringIO(stdout)
 
 ### TODO: figure out why jobstatus is being initialized as a None vs as a dict() and then checked for content ### pylint: disable=fixme
     # jobstatus = None
@@ -275,9 +279,9 @@ def submit(substr):
             r"Error in pbs.misc.submit(). Jobname (\"-N\s+(.*)\s\") not found in submit string.")
     
     p = subprocess.Popen(   #pylint: disable=invalid-name
-        "sbatch", stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        "sbatch", stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
     stdout, stderr = p.communicate(input=substr)       #pylint: disable=unused-variable
-    print stdout[:-1]
+    print(stdout[:-1])
     if re.search("error", stdout):
         raise PBSError(0, "PBS Submission error.\n" + stdout + "\n" + stderr)
     else:
@@ -287,21 +291,21 @@ def submit(substr):
 def delete(jobid):
     """scancel a PBS job."""
     p = subprocess.Popen(   #pylint: disable=invalid-name
-        ["scancel", jobid], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        ["scancel", jobid], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
     stdout, stderr = p.communicate()        #pylint: disable=unused-variable
     return p.returncode
 
 def hold(jobid):
     """scontrol delay a PBS job."""
     p = subprocess.Popen(   #pylint: disable=invalid-name
-        ["scontrol", "update", "JobId=", jobid, "StartTime=", "now+30days"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        ["scontrol", "update", "JobId=", jobid, "StartTime=", "now+30days"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
     stdout, stderr = p.communicate()    #pylint: disable=unused-variable
     return p.returncode
 
 def release(jobid):
     """scontrol un-delay a PBS job."""
     p = subprocess.Popen(   #pylint: disable=invalid-name
-        ["scontrol", "update", "JobId=", jobid, "StartTime=", "now"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        ["scontrol", "update", "JobId=", jobid, "StartTime=", "now"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
     stdout, stderr = p.communicate()    #pylint: disable=unused-variable
     return p.returncode
 
@@ -311,6 +315,6 @@ def alter(jobid, arg):
         'arg' is a pbs command option string. For instance, "-a 201403152300.19"
     """
     p = subprocess.Popen(   #pylint: disable=invalid-name
-        ["scontrol", "update", "JobId=", jobid] + arg.split(), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        ["scontrol", "update", "JobId=", jobid] + arg.split(), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
     stdout, stderr = p.communicate()    #pylint: disable=unused-variable
     return p.returncode
@@ -1,13 +1,17 @@
 """ Misc functions for interfacing between torque and the pbs module """
+from __future__ import print_function
 
 import subprocess
 import os
-import StringIO
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
 import re
 import datetime
 import time
 import sys
-from misc import getversion, getlogin, seconds, PBSError
+from .misc import getversion, getlogin, seconds, PBSError, STRING_TYPES
 
 def _qstat(jobid=None, username=getlogin(), full=False, version=getversion()):
     """Return the stdout of qstat minus the header lines.
@@ -26,10 +30,10 @@ def _qstat(jobid=None, username=getlogin(), full=False, version=getversion()):
         qopt += ["-u", username]
 
         # Call 'qselect' using subprocess
-        q = subprocess.Popen(qopt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)     #pylint: disable=invalid-name
+        q = subprocess.Popen(qopt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)     #pylint: disable=invalid-name
         stdout, stderr = q.communicate()    #pylint: disable=unused-variable
 
-        qsout = StringIO.StringIO(stdout)
+        qsout = StringIO(stdout)
 
         # Get the jobids
         jobid = []
@@ -47,21 +51,21 @@ def _qstat(jobid=None, username=getlogin(), full=False, version=getversion()):
     if full:
         opt += ["-f"]
     if jobid is not None:
-        if isinstance(jobid, str) or isinstance(jobid, unicode):
+        if isinstance(jobid, STRING_TYPES):
             jobid = [jobid]
         elif isinstance(jobid, list):
             pass
         else:
-            print "Error in pbs.misc.qstat(). type(jobid):", type(jobid)
+            print("Error in pbs.misc.qstat(). type(jobid):", type(jobid))
             sys.exit()
         opt += jobid
 
     # call 'qstat' using subprocess
     # print opt
-    p = subprocess.Popen(opt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)     #pylint: disable=invalid-name
+    p = subprocess.Popen(opt, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)     #pylint: disable=invalid-name
     stdout, stderr = p.communicate()        #pylint: disable=unused-variable
 
-    sout = StringIO.StringIO(stdout)
+    sout = StringIO(stdout)
 
     # strip the header lines
     if full is False:
@@ -83,7 +87,7 @@ def job_id(all=False, name=None):       #pylint: disable=redefined-builtin
     if all or name is not None:
         jobid = []
         stdout = _qstat()
-        sout = StringIO.StringIO(stdout)
+        sout = StringIO(stdout)
         for line in sout:
             if name is not None:
                 if line.split()[3] == name:
@@ -136,7 +140,7 @@ def job_status(jobid=None):
     status = dict()
 
     stdout = _qstat(jobid=jobid, full=True)
-    sout = StringIO.StringIO(stdout)
+    sout = StringIO(stdout)
 
 ### TODO: figure out why jobstatus is being initialized as a None vs as a dict() and then checked for content ### pylint: disable=fixme
     jobstatus = None
@@ -241,9 +245,9 @@ def submit(substr):
             r"Error in pbs.misc.submit(). Jobname (\"-N\s+(.*)\s\") not found in submit string.")
 
     p = subprocess.Popen(   #pylint: disable=invalid-name
-        "qsub", stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        "qsub", stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
     stdout, stderr = p.communicate(input=substr)       #pylint: disable=unused-variable
-    print stdout[:-1]
+    print(stdout[:-1])
     if re.search("error", stdout):
         raise PBSError(0, "PBS Submission error.\n" + stdout + "\n" + stderr)
     else:
@@ -253,21 +257,21 @@ def submit(substr):
 def delete(jobid):
     """qdel a PBS job."""
     p = subprocess.Popen(   #pylint: disable=invalid-name
-        ["qdel", jobid], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        ["qdel", jobid], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
     stdout, stderr = p.communicate()        #pylint: disable=unused-variable
     return p.returncode
 
 def hold(jobid):
     """qhold a PBS job."""
     p = subprocess.Popen(   #pylint: disable=invalid-name
-        ["qhold", jobid], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        ["qhold", jobid], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
     stdout, stderr = p.communicate()    #pylint: disable=unused-variable
     return p.returncode
 
 def release(jobid):
     """qrls a PBS job."""
     p = subprocess.Popen(   #pylint: disable=invalid-name
-        ["qrls", jobid], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        ["qrls", jobid], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
     stdout, stderr = p.communicate()    #pylint: disable=unused-variable
     return p.returncode
 
@@ -277,7 +281,7 @@ def alter(jobid, arg):
         'arg' is a pbs command option string. For instance, "-a 201403152300.19"
     """
     p = subprocess.Popen(   #pylint: disable=invalid-name
-        ["qalter"] + arg.split() + [jobid], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        ["qalter"] + arg.split() + [jobid], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
     stdout, stderr = p.communicate()    #pylint: disable=unused-variable
     return p.returncode
 
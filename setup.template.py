@@ -1,4 +1,7 @@
-from distutils.core import setup
+try:
+    from setuptools import setup
+except ImportError:
+    from distutils.core import setup
 setup(name='pbs', \
       version='VERSION_ID (git sha COMMIT_ID)', \
       description='PBS job submission and management', \
@@ -0,0 +1,141 @@
+""" Tests for pbs.Job.read() and pbs.Job.clone() """
+import os
+import unittest
+
+# pbs.jobdb looks up the login name at import time
+os.environ.setdefault("LOGNAME", "test")
+
+from pbs.job import Job, PBSReadError   #pylint: disable=wrong-import-position
+
+SCRIPT = """#!/bin/sh
+#PBS -S /bin/sh
+#PBS -N myjob
+#PBS -l walltime=1:00:00
+#PBS -l nodes=2:ppn=16
+#PBS -q fluxoe
+#PBS -V
+#PBS -p 0
+
+#auto=False
+
+cd $PBS_O_WORKDIR
+./run
+"""
+
+def make_job(**kwargs):
+    """ Return a Job with all attributes set, overridden by 'kwargs' """
+    args = dict(name="myjob", account="myaccount", nodes=2, ppn=16, walltime="10:00:00",
+                pmem="3800mb", qos="flux", queue="fluxoe", exetime="1100", message="abe",
+                email="jdoe@umich.edu", priority="-200", command="./run",
+                auto=True, software="torque")
+    args.update(kwargs)
+    return Job(**args)
+
+class TestJobRead(unittest.TestCase):
+    """ Tests for reading a submit script with Job(substr=...) """
+
+    def test_round_trip(self):
+        """ Reading Job.sub_string() gives back the same Job """
+        job = make_job()
+        read = Job(substr=job.sub_string(), software="torque")
+        for attr in Job.__slots__:
+            if attr != "command":
+                self.assertEqual(getattr(read, attr), getattr(job, attr), attr)
+        # the command is read with the newline that ends the script
+        self.assertEqual(read.command, job.command + "\n")
+
+    def test_defaults(self):
+        """ Optional arguments not in the script are set to their defaults """
+        job = Job(substr=SCRIPT, software="torque")
+        self.assertEqual(job.name, "myjob")
+        self.assertEqual(job.walltime, "1:00:00")
+        self.assertEqual((job.nodes, job.ppn), (2, 16))
+        self.assertEqual(job.queue, "fluxoe")
+        self.assertEqual(job.command, "./run\n")
+        self.assertIsNone(job.pmem)
+        self.assertIsNone(job.qos)
+        self.assertIsNone(job.email)
+        self.assertEqual(job.message, "a")
+        self.assertFalse(job.auto)
+
+    def test_comma_separated_resources(self):
+        """ -l resources may be comma separated """
+        script = SCRIPT.replace("#PBS -l walltime=1:00:00\n#PBS -l nodes=2:ppn=16",
+                                "#PBS -l walltime=1:00:00,nodes=2:ppn=16,pmem=1gb")
+        job = Job(substr=script, software="torque")
+        self.assertEqual(job.walltime, "1:00:00")
+        self.assertEqual((job.nodes, job.ppn), (2, 16))
+        self.assertEqual(job.pmem, "1gb")
+
+    def test_crlf(self):
+        """ Scripts with Windows line endings are read """
+        job = Job(substr=SCRIPT.replace("\n", "\r\n"), software="torque")
+        self.assertEqual(job.name, "myjob")
+        self.assertEqual(job.walltime, "1:00:00")
+        self.assertEqual((job.nodes, job.ppn), (2, 16))
+        self.assertEqual(job.queue, "fluxoe")
+        self.assertEqual(job.command.strip(), "./run")
+
+    def test_missing_cd(self):
+        """ A script without 'cd $PBS_O_WORKDIR' raises PBSReadError """
+        with self.assertRaises(PBSReadError) as cm:   #pylint: disable=invalid-name
+            Job(substr=SCRIPT.replace("cd $PBS_O_WORKDIR\n", ""), software="torque")
+        self.assertEqual(cm.exception.missing, ["cd $PBS_O_WORKDIR", "command"])
+
+    def test_empty_values(self):
+        """ Directives and resources with no value are not counted as found """
+        script = SCRIPT.replace("#PBS -q fluxoe", "#PBS -q")
+        script = script.replace("walltime=1:00:00", "walltime=,pmem=,qos=")
+        with self.assertRaises(PBSReadError) as cm:   #pylint: disable=invalid-name
+            Job(substr=script, software="torque")
+        self.assertEqual(cm.exception.missing, ["walltime", "queue"])
+
+    def test_bad_walltime(self):
+        """ A walltime must contain only digits and ':' """
+        script = SCRIPT.replace("walltime=1:00:00", "walltime=1h")
+        with self.assertRaises(PBSReadError) as cm:   #pylint: disable=invalid-name
+            Job(substr=script, software="torque")
+        self.assertEqual(cm.exception.missing, ["walltime"])
+
+    def test_bad_auto(self):
+        """ An '#auto=' value that is not true or false raises PBSReadError """
+        with self.assertRaises(PBSReadError):
+            Job(substr=SCRIPT.replace("#auto=False", "#auto=maybe"), software="torque")
+
+    def test_auto_true(self):
+        """ '#auto=True' sets Job.auto """
+        job = Job(substr=SCRIPT.replace("#auto=False", "#auto=True"), software="torque")
+        self.assertTrue(job.auto)
+
+class TestJobClone(unittest.TestCase):
+    """ Tests for Job.clone() """
+
+    def test_clone(self):
+        """ A clone has the same settings, any overrides, and no jobID """
+        job = make_job()
+        job.jobID = "1234.host"  #pylint: disable=invalid-name
+        new = job.clone(name="run2")
+        self.assertEqual(new.name, "run2")
+        self.assertEqual(job.name, "myjob")
+        self.assertIsNone(new.jobID)
+        self.assertEqual(new.sub_string(), job.clone().sub_string().replace("myjob", "run2"))
+
+    def test_clone_normalizes(self):
+        """ Overrides are normalized as in Job.__init__ """
+        new = make_job().clone(nodes="3", ppn="4", auto=0)
+        self.assertEqual((new.nodes, new.ppn), (3, 4))
+        self.assertIs(new.auto, False)
+
+    def test_clone_subclass(self):
+        """ Attributes added by a subclass are copied """
+        class MyJob(Job):   #pylint: disable=too-few-public-methods
+            """ A Job subclass with an extra attribute """
+            pass
+        job = MyJob(nodes=1, ppn=1, software="torque")
+        job.extra = "value"     #pylint: disable=attribute-defined-outside-init
+        new = job.clone()
+        self.assertIsInstance(new, MyJob)
+        self.assertEqual(new.extra, "value")
+
+if __name__ == "__main__":
+    unittest.main()